@@ -1,3 +1,5 @@
+import collections.abc
+
 import pytest
 
 import znslice
@@ -74,3 +76,109 @@ def test_from_LazySequence_err():
 def test_LazySequence_repr():
     lst = znslice.LazySequence.from_obj([1, 2, 3], indices=[0, 2])
     assert repr(lst) == "LazySequence([[1, 2, 3]], [[0, 2]])"
+
+
+class GrowingList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+        self.loaded = []
+
+    @znslice.znslice(lazy=True, advanced_slicing=True)
+    def __getitem__(self, item):
+        self.loaded.extend([item] if isinstance(item, int) else item)
+        if isinstance(item, int):
+            return self.data[item]
+        return [self.data[x] for x in item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+def test_LiveSequence():
+    data = GrowingList(list(range(5)))
+    lst = znslice.LiveSequence(data)
+    assert len(lst) == 5
+    assert lst.tolist() == [0, 1, 2, 3, 4]
+
+    data.data.extend([5, 6, 7])
+    assert len(lst) == 8
+    assert lst[-1] == 7
+    assert lst[3:].tolist() == [3, 4, 5, 6, 7]
+    # existing items are loaded from the cache
+    assert data.loaded == [0, 1, 2, 3, 4, 7, 5, 6]
+
+    frozen = lst[:]
+    assert isinstance(frozen, znslice.LazySequence)
+    assert not isinstance(frozen, znslice.LiveSequence)
+    data.data.append(8)
+    assert len(frozen) == 8
+    assert len(lst) == 9
+    assert list(lst) == list(range(9))
+
+
+def test_LiveSequence_new_items():
+    data = GrowingList(list(range(3)))
+    lst = znslice.LiveSequence(data, start=1)
+    assert lst.new_items().tolist() == [1, 2]
+    assert len(lst.new_items()) == 0
+    data.data.extend([3, 4])
+    assert lst.new_items().tolist() == [3, 4]
+    assert lst.tolist() == [1, 2, 3, 4]
+
+
+def test_LiveSequence_segments():
+    data = GrowingList([])
+    lst = znslice.LiveSequence(data)
+    assert len(lst) == 0
+    for idx in range(100):
+        data.data.append(idx)
+        assert lst.refresh() == 1
+    assert lst.refresh() == 0
+    assert len(lst._indices) <= 7
+    assert sum(lst._indices, []) == list(range(100))
+
+    added = lst + znslice.LazySequence.from_obj([100, 101])
+    data.data.append(100)
+    assert len(added) == 102
+    assert added[-3:].tolist() == [99, 100, 101]
+    assert len(lst) == 101
+
+
+def test_LiveSequence_add_after_append():
+    data = GrowingList(list(range(3)))
+    lst = znslice.LiveSequence(data)
+    other = znslice.LazySequence.from_obj([9])
+    data.data.extend([3, 4])
+    assert (lst + other).tolist() == [0, 1, 2, 3, 4, 9]
+    data.data.append(5)
+    assert (other + lst).tolist() == [9, 0, 1, 2, 3, 4, 5]
+    data.data.append(6)
+    assert lst + [7] == [0, 1, 2, 3, 4, 5, 6, 7]
+
+    other_data = GrowingList([10])
+    other_live = znslice.LiveSequence(other_data)
+    other_data.data.append(11)
+    data.data.append(7)
+    assert (lst + other_live).tolist() == list(range(8)) + [10, 11]
+
+    data.data.append(8)
+    assert "8]]" in repr(lst)
+
+
+class LenCountGrowingList(GrowingList):
+    def __init__(self, data):
+        super().__init__(data)
+        self.len_calls = 0
+
+    def __len__(self):
+        self.len_calls += 1
+        return super().__len__()
+
+
+def test_LiveSequence_len_calls():
+    data = LenCountGrowingList(list(range(10)))
+    lst = znslice.LiveSequence(data)
+    data.len_calls = 0
+    # one refresh per access: 'len' from 'list', 10 items and the IndexError
+    assert list(lst) == list(range(10))
+    assert data.len_calls == 12
@@ -0,0 +1,126 @@
+import collections.abc
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+import znslice
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Return the fastest of 'repeat' runs of 'func' in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class MemmapList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+
+    @znslice.znslice(advanced_slicing=True)
+    def __getitem__(self, item):
+        return self.data[item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+class MemmapArray(MemmapList):
+    @znslice.znslice(array=True)
+    def __getitem__(self, item):
+        return self.data[item]
+
+
+@pytest.fixture
+def memmap(tmp_path):
+    data = np.lib.format.open_memmap(
+        tmp_path / "data.npy", mode="w+", dtype=float, shape=(50_000, 3)
+    )
+    data[:] = np.random.randn(*data.shape)
+    data.flush()
+    return np.load(tmp_path / "data.npy", mmap_mode="r")
+
+
+def test_array_against_memmap(memmap):
+    npt.assert_array_equal(MemmapArray(memmap)[:], memmap)
+    npt.assert_array_equal(MemmapArray(memmap)[::7], memmap[::7])
+    npt.assert_array_equal(MemmapList(memmap)[::7], memmap[::7])
+
+    # loading everything at once with a cold cache
+    list_time = best_of(lambda: MemmapList(memmap)[:])
+    array_time = best_of(lambda: MemmapArray(memmap)[:])
+    assert array_time * 5 < list_time
+
+    # gathering a strided selection as an array from a warm cache
+    lst, arr = MemmapList(memmap), MemmapArray(memmap)
+    _, _ = lst[:], arr[:]
+    list_time = best_of(lambda: np.array(lst[::3]))
+    array_time = best_of(lambda: arr[::3])
+    assert array_time < list_time
+
+
+class CacheList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+
+    @znslice.znslice
+    def __getitem__(self, item):
+        return self.data[item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+def timing_ratio(stmt: str, baseline: str, namespace: dict) -> float:
+    """Return the ratio of the best timings of 'stmt' and 'baseline'.
+
+    Each sample runs long enough (about 20 ms for 'baseline') that scheduler
+    noise does not dominate the timings of very fast statements.
+    """
+    number, _ = timeit.Timer(baseline, globals=namespace).autorange()
+    number = max(number // 10, 1)
+
+    def best(x: str) -> float:
+        return min(timeit.repeat(x, number=number, repeat=5, globals=namespace))
+
+    return best(stmt) / best(baseline)
+
+
+def test_cached_item_overhead():
+    lst = CacheList(list(range(1000)))
+    namespace = {"lst": lst, "data": dict(enumerate(lst[:]))}
+
+    # cached single items skip the index conversion and cache handling
+    assert timing_ratio("lst[5]", "data[5]", namespace) < 20
+    # negative indices additionally need 'len(lst)'
+    assert timing_ratio("lst[-1]", "data[999]", namespace) < 25
+
+
+def test_cached_full_range_overhead():
+    lst = CacheList(list(range(16)))
+    namespace = {"lst": lst, "data": dict(enumerate(lst[:]))}
+
+    # a cached 'lst[:]' is gathered without converting the slice to indices
+    baseline = "list(map(data.__getitem__, range(16)))"
+    assert timing_ratio("lst[:]", baseline, namespace) < 4
+
+
+def test_block_cache_memory():
+    def allocated(cache) -> int:
+        values = list(range(100_000))
+        tracemalloc.start()
+        for idx, value in enumerate(values):
+            cache[idx] = value
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size
+
+    block_cache = znslice.cache.BlockCache(block_size=1024)
+    assert allocated(block_cache) * 4 < allocated({})
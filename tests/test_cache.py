@@ -0,0 +1,180 @@
+import collections.abc
+import functools
+import gc
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+import znslice
+
+
+class Value:
+    def __init__(self, value):
+        self.value = value
+
+
+class WeakCacheList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+        self.calls = 0
+
+    @znslice.znslice(cache=functools.partial(znslice.WeakValueCache, maxsize=2))
+    def __getitem__(self, item):
+        self.calls += 1
+        return Value(self.data[item])
+
+    def __len__(self):
+        return len(self.data)
+
+
+class ArrayList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+
+    @znslice.znslice
+    def __getitem__(self, item):
+        return self.data[item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+def test_WeakValueCache():
+    cache = znslice.WeakValueCache(maxsize=2)
+    values = [Value(x) for x in range(4)]
+    for idx, value in enumerate(values):
+        cache[idx] = value
+    assert len(cache) == 4
+    assert cache[0] is values[0]
+
+    del values
+    gc.collect()
+    # only the two most recently used values are kept alive
+    assert sorted(cache) == [0, 3]
+    assert cache[3].value == 3
+    with pytest.raises(KeyError):
+        _ = cache[1]
+
+    del cache[3]
+    assert list(cache) == [0]
+    with pytest.raises(KeyError):
+        del cache[3]
+
+
+def test_WeakValueCache_not_weakrefable():
+    cache = znslice.WeakValueCache(maxsize=2)
+    for idx in range(4):
+        cache[idx] = [idx]
+    assert dict(cache.items()) == {2: [2], 3: [3]}
+
+
+def test_WeakCacheList():
+    lst = WeakCacheList(list(range(10)))
+    values = lst[:]
+    assert [x.value for x in values] == list(range(10))
+    assert lst.calls == 10
+
+    # values referenced by 'values' are shared and not loaded again
+    assert lst[5] is values[5]
+    assert lst[[1, 2]] == values[1:3]
+    assert lst.calls == 10
+    assert znslice.cache_info(lst).items == 10
+
+    del values
+    gc.collect()
+    assert znslice.cache_info(lst).items == 2
+    assert [x.value for x in lst[:]] == list(range(10))
+    assert lst.calls == 18
+
+
+def test_cache_info():
+    lst = ArrayList([np.zeros(100), np.zeros(200)])
+    assert znslice.cache_info(lst) == znslice.CacheInfo(items=0, nbytes=0)
+    _ = lst[0]
+    assert znslice.cache_info(lst) == znslice.CacheInfo(items=1, nbytes=800)
+    _ = lst[:]
+    assert znslice.cache_info(lst) == znslice.CacheInfo(items=2, nbytes=2400)
+    _ = lst[znslice.Reset(0)]
+    assert znslice.cache_info(lst).items == 2
+
+    with pytest.raises(TypeError):
+        znslice.cache_info([1, 2, 3])
+
+
+def test_ArrayCache():
+    cache = znslice.cache.ArrayCache()
+    npt.assert_array_equal(cache.missing([3, 1, 2, 1]), [1, 2, 3])
+    cache.add([1, 2, 3], np.array([10, 20, 30]))
+    npt.assert_array_equal(cache.missing([0, 1, 4]), [0, 4])
+    cache.add([0, 4], np.array([0, 40]))
+    assert len(cache._chunks) == 2
+    npt.assert_array_equal(cache.take([4, 0, 2]), [40, 0, 20])
+    # blocks are merged once the preceding block is not larger
+    cache.add([5, 6], np.array([50, 60]))
+    assert len(cache._chunks) == 1
+    npt.assert_array_equal(cache.take(range(7)), [0, 10, 20, 30, 40, 50, 60])
+    assert len(cache) == 7
+    assert cache.nbytes == 7 * np.array([0]).itemsize
+
+    cache.reset([0, 1])
+    assert len(cache) == 5
+    with pytest.raises(KeyError):
+        cache.take([0])
+    with pytest.raises(ValueError):
+        cache.add([5, 6], np.array([1]))
+
+
+def test_ArrayCache_add_twice():
+    cache = znslice.cache.ArrayCache()
+    cache.add([0, 1, 2], np.array([0, 10, 20]))
+    # e.g. two threads loading the same range, the second block is skipped
+    cache.add([0, 1, 2], np.array([0, 10, 20]))
+    cache.add([2, 3], np.array([20, 30]))
+    assert len(cache) == 4
+    assert cache.nbytes == 4 * np.array([0]).itemsize
+    npt.assert_array_equal(cache.take(range(4)), [0, 10, 20, 30])
+
+    cache.reset([1])
+    npt.assert_array_equal(cache.missing(range(4)), [1])
+    npt.assert_array_equal(cache.take([0, 2, 3]), [0, 20, 30])
+
+
+def test_BlockCache():
+    cache = znslice.cache.BlockCache(block_size=4)
+    for idx in range(10):
+        cache[idx] = idx * 10
+    assert len(cache._blocks) == 3
+    assert len(cache) == 10
+    assert list(cache) == list(range(10))
+    assert cache[9] == 90
+    with pytest.raises(KeyError):
+        _ = cache[10]
+    with pytest.raises(KeyError):
+        _ = cache[100]
+
+    # full blocks are dropped, partial blocks are cleared
+    cache.reset_range(3, 9)
+    assert list(cache) == [0, 1, 2, 9]
+    assert len(cache._blocks) == 2
+    cache.reset_range(1, 2)
+    assert list(cache) == [0, 2, 9]
+
+    del cache[9]
+    assert len(cache._blocks) == 1
+    with pytest.raises(KeyError):
+        del cache[9]
+    assert cache.values() == [0, 20]
+
+
+def test_BlockCache_max_blocks():
+    cache = znslice.cache.BlockCache(block_size=2, max_blocks=2)
+    for idx in range(4):
+        cache[idx] = idx
+    _ = cache[0]
+    cache[4] = 4
+    # the least recently used block is evicted as a unit
+    assert list(cache) == [0, 1, 4]
+
+    with pytest.raises(ValueError):
+        znslice.cache.BlockCache(block_size=0)
@@ -0,0 +1,85 @@
+import collections.abc
+import io
+import json
+import os
+import subprocess
+import sys
+
+import znslice
+
+
+class LazyCacheList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+
+    @znslice.znslice(lazy=True)
+    def __getitem__(self, item):
+        return self.data[item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+def test_Tracer():
+    lst = LazyCacheList(list(range(10)))
+    with znslice.tracing.Tracer() as tracer:
+        assert lst[::2].tolist() == [0, 2, 4, 6, 8]
+        assert lst[2] == 2
+    names = {x.name for x in tracer.spans}
+    assert names == {
+        "znslice(LazyCacheList.__getitem__)",
+        "LazyCacheList.__getitem__",
+        "item_to_indices",
+        "handle_item",
+        "LazySequence.tolist",
+    }
+    loads = [x for x in tracer.spans if x.name == "LazyCacheList.__getitem__"]
+    assert len(loads) == 5
+    assert all(x.parent == "handle_item" for x in loads)
+    # 'lst[::2]', its 'tolist' and the cached 'lst[2]' are recorded
+    wrapper = [x for x in tracer.spans if x.name.startswith("znslice(")]
+    assert len(wrapper) == 3
+    assert all(0 <= x.own_duration <= x.duration for x in tracer.spans)
+
+    # nothing is recorded without an active Tracer
+    _ = lst[[1, 3]].tolist()
+    assert {x.name for x in tracer.spans} == names
+    assert znslice.tracing.span("test") is znslice.tracing._NULL_SPAN
+
+
+def test_Tracer_LazySequence():
+    lst = znslice.LazySequence.from_obj([1, 2, 3])
+    with znslice.tracing.Tracer() as tracer:
+        assert lst[1] == 2
+    assert [x.name for x in tracer.spans] == [
+        "item_to_indices",
+        "get_matched_indices",
+        "LazySequence.tolist",
+        "LazySequence.__getitem__",
+    ]
+
+
+def test_Tracer_export(tmp_path):
+    lst = LazyCacheList(list(range(10)))
+    with znslice.tracing.Tracer() as tracer:
+        _ = lst[:].tolist()
+
+    trace = tracer.to_chrome_trace(tmp_path / "trace.json")
+    assert json.loads((tmp_path / "trace.json").read_text()) == trace
+    assert len(trace["traceEvents"]) == len(tracer.spans)
+    assert trace["traceEvents"][0]["ph"] == "X"
+
+    stats = tracer.to_pstats()
+    assert stats.total_calls == len(tracer.spans)
+    stats.stream = io.StringIO()
+    stats.sort_stats("cumulative").print_stats()
+    assert "LazyCacheList.__getitem__" in stats.stream.getvalue()
+
+
+def test_Tracer_environment(tmp_path):
+    script = "import znslice; znslice.LazySequence.from_obj([1, 2, 3])[1]"
+    for file in (tmp_path / "trace.json", tmp_path / "trace.prof"):
+        env = {**os.environ, "ZNSLICE_TRACE": str(file)}
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+        assert file.exists()
+    assert len(json.loads((tmp_path / "trace.json").read_text())["traceEvents"]) == 4
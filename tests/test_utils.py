@@ -68,3 +68,20 @@ def test_check_sorted():
     assert not znslice.utils.check_sorted([2, 5, 1])
     assert znslice.utils.check_sorted([-3, -2, -1])
     assert not znslice.utils.check_sorted([-1, -2, -3])
+
+
+def test_LazyLength():
+    calls = []
+
+    def func():
+        calls.append(1)
+        return 10
+
+    length = znslice.utils.LazyLength(func)
+    assert not calls
+    assert znslice.utils.item_to_indices(3, length) == 3
+    assert not calls
+    assert znslice.utils.item_to_indices([-1, -2, 3], length) == [9, 8, 3]
+    assert znslice.utils.item_to_indices(slice(None, None, 4), length) == [0, 4, 8]
+    assert len(length) == 10
+    assert len(calls) == 1
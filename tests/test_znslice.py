@@ -1,4 +1,5 @@
 import collections.abc
+import gc
 
 import numpy as np
 import numpy.testing as npt
@@ -325,3 +326,316 @@ def test_unsorted_slice():
     concat = data[:5] + data[5:]
     with pytest.raises(ValueError):
         _ = concat[[2, 3, 1]]
+
+
+class ArrayCacheList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+        self.keys = []
+
+    @znslice.znslice(array=True)
+    def __getitem__(self, item):
+        self.keys.append(item)
+        return self.data[item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+class LazyArrayCacheList(ArrayCacheList):
+    @znslice.znslice(array=True, lazy=True)
+    def __getitem__(self, item):
+        self.keys.append(item)
+        return self.data[item]
+
+
+def test_LazyArrayCacheList():
+    lst = LazyArrayCacheList(np.arange(10) * 10)
+    assert lst[2] == 20
+    data = lst[::2]
+    assert isinstance(data, znslice.LazySequence)
+    assert data._indices == [[0, 2, 4, 6, 8]]
+    assert all(type(x) is int for x in data._indices[0])
+    npt.assert_array_equal(data.tolist(), [0, 20, 40, 60, 80])
+    npt.assert_array_equal(lst[-3:].tolist(), [70, 80, 90])
+    npt.assert_array_equal((lst[:2] + lst[8:]).tolist(), [0, 10, 80, 90])
+
+
+def test_ArrayCacheList_empty():
+    lst = ArrayCacheList(np.arange(20, dtype=np.int32).reshape(10, 2))
+    # nothing is cached yet
+    assert lst[10:20].shape == (0, 2)
+    assert lst[10:20].dtype == np.int32
+    _ = lst[:3]
+    assert lst[5:5].shape == (0, 2)
+    assert lst[5:5].dtype == np.int32
+
+
+@pytest.mark.parametrize("cls", [ArrayCacheList, LazyArrayCacheList])
+def test_ArrayCacheList_iter(cls):
+    lst = cls(np.arange(5) * 10)
+    assert list(lst) == [0, 10, 20, 30, 40]
+    assert [x for x in lst] == [0, 10, 20, 30, 40]
+    with pytest.raises(IndexError):
+        _ = lst[5]
+    with pytest.raises(IndexError):
+        _ = lst[[3, 7]]
+
+
+def test_ArrayCacheList():
+    lst = ArrayCacheList(np.arange(10) * 10)
+    assert lst[2] == 20
+    npt.assert_array_equal(lst[3:6], [30, 40, 50])
+    npt.assert_array_equal(lst[[1, 2, 3, 8]], [10, 20, 30, 80])
+    npt.assert_array_equal(lst[:], np.arange(10) * 10)
+    assert lst.keys[:2] == [slice(2, 3), slice(3, 6)]
+    npt.assert_array_equal(lst.keys[2], [1, 8])
+    npt.assert_array_equal(lst.keys[3], [0, 6, 7, 9])
+
+    # everything is cached now
+    lst.data = np.arange(10) * 100
+    npt.assert_array_equal(lst[::2], [0, 20, 40, 60, 80])
+    assert len(lst.keys) == 4
+    npt.assert_array_equal(lst[znslice.Reset(slice(4, 6))], [400, 500])
+    assert lst.keys[-1] == slice(4, 6)
+    npt.assert_array_equal(lst[3:7], [30, 400, 500, 60])
+    assert znslice.cache_info(lst) == znslice.CacheInfo(
+        items=10, nbytes=lst.data.nbytes
+    )
+
+
+@pytest.mark.parametrize("cls", [ArrayCacheList, LazyArrayCacheList])
+def test_ArrayCacheList_numpy_items(cls):
+    lst = cls(np.arange(10) * 10)
+    assert lst[np.int64(2)] == 20
+    assert lst[np.int32(-1)] == 90
+    result = lst[np.array([1, 2, -2], dtype=np.int32)]
+    if isinstance(result, znslice.LazySequence):
+        result = result.tolist()
+    npt.assert_array_equal(result, [10, 20, 80])
+    with pytest.raises(IndexError):
+        _ = lst[np.array([3, 10])]
+    with pytest.raises(ValueError):
+        _ = lst[np.array([1.0, 2.0])]
+
+
+class LenCountList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+        self.version = 0
+        self.len_calls = 0
+
+    @znslice.znslice(lazy=True, cache_len=True)
+    def __getitem__(self, item):
+        return self.data[item]
+
+    def __len__(self):
+        self.len_calls += 1
+        return len(self.data)
+
+
+class LenVersionList(LenCountList):
+    @znslice.znslice(cache_len=lambda self: self.version)
+    def __getitem__(self, item):
+        return self.data[item]
+
+
+def test_cache_len():
+    lst = LenCountList(list(range(100)))
+    assert lst[5] == 5
+    assert lst.len_calls == 0
+    assert lst[list(range(-1, -51, -1))].tolist() == list(range(99, 49, -1))
+    assert lst.len_calls == 1
+    assert lst[::2].tolist() == list(range(0, 100, 2))
+    assert lst[-1] == 99
+    assert lst.len_calls == 1
+
+    with pytest.raises(IndexError):
+        _ = lst[[1, 100]]
+
+    lst.data = list(range(200))
+    assert lst[-1] == 99
+    # 'Reset' evaluates the length again
+    assert lst[znslice.Reset(-1)] == 199
+    assert lst.len_calls == 2
+
+
+def test_cache_len_token():
+    lst = LenVersionList(list(range(10)))
+    assert lst[-1] == 9
+    assert lst[-2] == 8
+    assert lst.len_calls == 1
+    lst.data = list(range(20))
+    lst.version += 1
+    assert lst[-1] == 19
+    assert lst.len_calls == 2
+
+
+class BatchList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+        self.batches = []
+
+    @znslice.znslice(advanced_slicing=True, lazy=True)
+    def __getitem__(self, item):
+        self.batches.append(item)
+        if isinstance(item, int):
+            return self.data[item]
+        return [self.data[x] for x in item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_warm(workers):
+    lst = BatchList(list(range(100)))
+    assert lst[5] == 5
+    progress = []
+    report = znslice.warm(
+        lst,
+        slice(None, 50),
+        workers=workers,
+        batch_size=10,
+        callback=lambda *args: progress.append(args),
+    )
+    assert report.loaded == 49
+    assert report.cached == 1
+    assert report.throughput > 0
+    assert sorted(len(x) for x in lst.batches[1:]) == [9, 10, 10, 10, 10]
+    assert progress[-1] == (49, 49)
+    assert len(progress) == 5
+
+    lst.data = list(range(100, 200))
+    assert lst[:50].tolist() == list(range(50))
+    report = znslice.warm(lst, [10, -1])
+    assert (report.loaded, report.cached) == (1, 1)
+    assert lst[-1] == 199
+
+
+def test_warm_from_file(tmp_path):
+    (tmp_path / "indices.txt").write_text("1\n2\n3,5\n")
+    lst = BatchList(list(range(10)))
+    assert znslice.warm(lst, tmp_path / "indices.txt").loaded == 4
+    assert lst.batches == [[1, 2, 3, 5]]
+    assert znslice.warm(lst).loaded == 6
+
+    with pytest.raises(ValueError):
+        znslice.warm(NoCacheList(list(range(10))))
+    with pytest.raises(TypeError):
+        znslice.warm(list(range(10)))
+
+
+def test_warm_array():
+    lst = ArrayCacheList(np.arange(100))
+    report = znslice.warm(lst, slice(10, 60), batch_size=25)
+    assert report.loaded == 50
+    assert lst.keys == [slice(10, 35), slice(35, 60)]
+    assert znslice.cache_info(lst).items == 50
+
+
+def test_cache_removed_with_instance():
+    lst = CacheList(list(range(10)))
+    assert lst[:] == list(range(10))
+    assert znslice.cache_info(lst).items == 10
+    del lst
+    gc.collect()
+    # a new instance, possibly with the same 'id', starts with an empty cache
+    lst = CacheList(list(range(10, 20)))
+    assert znslice.cache_info(lst).items == 0
+    assert lst[:] == list(range(10, 20))
+
+
+class BlockList(collections.abc.Sequence):
+    def __init__(self, data):
+        self.data = data
+        self.batches = []
+
+    @znslice.znslice(advanced_slicing=True, block_size=4, max_blocks=2)
+    def __getitem__(self, item):
+        self.batches.append(item)
+        return [self.data[x] for x in item]
+
+    def __len__(self):
+        return len(self.data)
+
+
+def test_BlockList():
+    lst = BlockList(list(range(10)))
+    assert lst[5] == 5
+    assert lst.batches == [[4, 5, 6, 7]]
+    assert lst[[4, 7]] == [4, 7]
+    assert lst[-1] == 9
+    assert lst.batches[-1] == [8, 9]
+    # more blocks than 'max_blocks' are requested at once
+    assert lst[:] == list(range(10))
+    assert lst.batches[-3:] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert znslice.cache_info(lst).items == 6
+
+    lst.data = list(range(10, 20))
+    assert lst[[4, 9]] == [4, 9]
+    # the whole block is dropped and loaded again
+    assert lst[znslice.Reset(slice(4, 8))] == [14, 15, 16, 17]
+    assert lst.batches[-1] == [4, 5, 6, 7]
+    assert lst[9] == 9
+    with pytest.raises(IndexError):
+        _ = lst[10]
+    batches = len(lst.batches)
+    # no block is loaded or cached for indices before the first item
+    with pytest.raises(IndexError):
+        _ = lst[-11]
+    with pytest.raises(IndexError):
+        _ = lst[[-12, 0]]
+    assert len(lst.batches) == batches
+    assert -1 not in BlockList.__getitem__.get_cache(lst)._blocks
+
+
+class BlockLenList(LenCountList):
+    @znslice.znslice(block_size=4, cache_len=True)
+    def __getitem__(self, item):
+        return self.data[item]
+
+
+def test_BlockList_cache_len():
+    lst = BlockLenList(list(range(10)))
+    assert lst[1] == 1
+    assert lst[5] == 5
+    assert lst[9] == 9
+    assert lst.len_calls == 1
+    with pytest.raises(IndexError):
+        _ = lst[[2, 10]]
+    assert lst.len_calls == 1
+
+
+def test_decorator_option_errors():
+    def func(self, item):
+        return item
+
+    with pytest.raises(ValueError):
+        znslice.znslice(block_size=4, array=True)(func)
+    with pytest.raises(ValueError):
+        znslice.znslice(block_size=4, cache=False)(func)
+    with pytest.raises(ValueError):
+        znslice.znslice(max_blocks=4)(func)
+    with pytest.raises(ValueError):
+        znslice.znslice(array=True, cache=znslice.WeakValueCache)(func)
+
+
+def test_full_range_fast_path():
+    lst = CacheList(list(range(5)))
+    assert lst[:] == [0, 1, 2, 3, 4]
+    lst.data = list(range(10, 16))
+    # only cached items are returned directly, the new item is loaded
+    assert lst[:] == [0, 1, 2, 3, 4, 15]
+    assert lst[::1] == [0, 1, 2, 3, 4, 15]
+
+
+def test_negative_int_fast_path():
+    lst = CacheList(list(range(5)))
+    assert lst[:] == [0, 1, 2, 3, 4]
+    assert lst[-1] == 4
+    lst.data = list(range(10, 16))
+    # negative indices are resolved with the current length
+    assert lst[-2] == 4
+    assert lst[-1] == 15
+    assert lst[-6] == 0
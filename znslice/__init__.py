@@ -1,8 +1,30 @@
 """The znslice package."""
 import importlib.metadata
 
-from znslice import utils
-from znslice.znslice import LazySequence, Reset, znslice
+from znslice import tracing, utils
+from znslice.cache import WeakValueCache
+from znslice.znslice import (
+    CacheInfo,
+    LazySequence,
+    LiveSequence,
+    Reset,
+    WarmupReport,
+    cache_info,
+    warm,
+    znslice,
+)
 
-__all__ = ["znslice", "LazySequence", "Reset", "utils"]
+__all__ = [
+    "znslice",
+    "LazySequence",
+    "LiveSequence",
+    "Reset",
+    "utils",
+    "tracing",
+    "WeakValueCache",
+    "CacheInfo",
+    "cache_info",
+    "warm",
+    "WarmupReport",
+]
 __version__ = importlib.metadata.version("znslice")
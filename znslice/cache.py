@@ -0,0 +1,344 @@
+"""ZnSlice cache module."""
+import collections
+import collections.abc
+import itertools
+import threading
+import weakref
+
+from znslice import utils
+
+# 'numpy' is imported on the first use of 'ArrayCache' to keep 'import znslice' fast.
+np = None
+
+
+class WeakValueCache(collections.abc.MutableMapping):
+    """Cache that keeps values only while they are referenced elsewhere.
+
+    The most recently used values are additionally held by a small strong
+    LRU front, so values are not dropped the moment the last consumer
+    releases them. Values that do not support weak references
+    (e.g. 'int' or 'list') are only held by the LRU front.
+
+    Use it via 'znslice(cache=WeakValueCache)' or, to change the size of the
+    LRU front, 'znslice(cache=functools.partial(WeakValueCache, maxsize=16))'.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """Initialize the WeakValueCache.
+
+        Parameters
+        ----------
+        maxsize: int, default=128
+            number of values to keep strong references to.
+        """
+        self.maxsize = maxsize
+        self._weak = weakref.WeakValueDictionary()
+        self._strong = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def _remember(self, key, value):
+        """Move the value to the front of the strong LRU cache."""
+        with self._lock:
+            self._strong[key] = value
+            self._strong.move_to_end(key)
+            while len(self._strong) > self.maxsize:
+                self._strong.popitem(last=False)
+
+    def __getitem__(self, key):
+        """Get a value and mark it as recently used."""
+        with self._lock:
+            try:
+                value = self._strong[key]
+            except KeyError:
+                value = self._weak[key]
+            self._remember(key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        """Store a value."""
+        with self._lock:
+            try:
+                self._weak[key] = value
+            except TypeError:
+                # the value does not support weak references
+                self._weak.pop(key, None)
+            self._remember(key, value)
+
+    def __delitem__(self, key):
+        """Remove a value."""
+        with self._lock:
+            if key not in self._strong and key not in self._weak:
+                raise KeyError(key)
+            self._strong.pop(key, None)
+            self._weak.pop(key, None)
+
+    def _snapshot(self) -> dict:
+        """Return all values that are still alive without touching the LRU order."""
+        with self._lock:
+            return {**dict(self._weak.items()), **self._strong}
+
+    def __iter__(self):
+        """Iterate over the keys of all values that are still alive."""
+        return iter(self._snapshot())
+
+    def __len__(self) -> int:
+        """Return the number of values that are still alive."""
+        return len(self._snapshot())
+
+    def items(self):
+        """Return a snapshot of all (key, value) pairs that are still alive."""
+        return self._snapshot().items()
+
+    def values(self):
+        """Return a snapshot of all values that are still alive."""
+        return self._snapshot().values()
+
+
+class ArrayCache:
+    """Cache storing array results as blocks instead of per-item entries.
+
+    Each block is a pair of sorted index and value arrays. Blocks are merged
+    with the preceding block once it is not larger than the new one, so the
+    number of blocks stays logarithmic in the number of cached items.
+    The list of blocks is replaced instead of modified, so readers can use
+    it while another thread adds blocks. Requires 'numpy'.
+    """
+
+    def __init__(self):
+        """Initialize the ArrayCache."""
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError as err:
+                raise ImportError(
+                    "'ArrayCache' requires 'numpy' to be installed."
+                ) from err
+        self._chunks = []
+        self._lock = threading.Lock()
+
+    def missing(self, indices):
+        """Return the sorted, unique indices that are not cached."""
+        indices = np.asarray(indices, dtype=int)
+        if not (np.diff(indices) > 0).all():
+            indices = np.unique(indices)
+        for keys, _ in self._chunks:
+            indices = indices[~self._locate(keys, indices)[1]]
+        return indices
+
+    @staticmethod
+    def _locate(keys, indices) -> tuple:
+        """Return the position of 'indices' in 'keys' and which were found."""
+        position = np.minimum(np.searchsorted(keys, indices), len(keys) - 1)
+        return position, keys[position] == indices
+
+    def add(self, keys, values):
+        """Add a block of sorted, unique 'keys'.
+
+        Keys that are already cached, e.g. loaded by another thread in the
+        meantime, are skipped, so every index is stored only once.
+        """
+        keys = np.asarray(keys, dtype=int)
+        values = np.asarray(values)
+        if len(keys) != len(values):
+            raise ValueError(
+                f"Got {len(values)} values for {len(keys)} indices from getitem."
+            )
+        with self._lock:
+            chunks = list(self._chunks)
+            for old_keys, _ in chunks:
+                if len(keys) == 0:
+                    break
+                new = ~self._locate(old_keys, keys)[1]
+                keys, values = keys[new], values[new]
+            if len(keys) == 0:
+                return
+            while chunks and len(chunks[-1][0]) <= len(keys):
+                old_keys, old_values = chunks.pop()
+                keys = np.concatenate([old_keys, keys])
+                values = np.concatenate([old_values, values])
+                order = np.argsort(keys, kind="stable")
+                keys, values = keys[order], values[order]
+            chunks.append((keys, values))
+            self._chunks = chunks
+
+    def take(self, indices):
+        """Gather the values for 'indices' from the cached blocks.
+
+        Raises a KeyError if nothing is cached, even for empty 'indices',
+        because the dtype and shape of the values are not known yet.
+        """
+        indices = np.asarray(indices, dtype=int)
+        chunks = self._chunks
+        if not chunks:
+            raise KeyError(int(indices[0]) if len(indices) else None)
+        if len(chunks) == 1:
+            keys, values = chunks[0]
+            position, hit = self._locate(keys, indices)
+            if not hit.all():
+                raise KeyError(int(indices[~hit][0]))
+            return values[position]
+        dtype = np.result_type(*{values.dtype for _, values in chunks})
+        shape = chunks[0][1].shape[1:]
+        data = np.empty((len(indices), *shape), dtype=dtype)
+        found = np.zeros(len(indices), dtype=bool)
+        for keys, values in chunks:
+            position, hit = self._locate(keys, indices)
+            data[hit] = values[position[hit]]
+            found |= hit
+        if not found.all():
+            raise KeyError(int(indices[~found][0]))
+        return data
+
+    def reset(self, indices):
+        """Remove the given indices from the cache."""
+        indices = np.asarray(indices, dtype=int)
+        with self._lock:
+            chunks = []
+            for keys, values in self._chunks:
+                keep = ~np.isin(keys, indices)
+                if keep.any():
+                    chunks.append((keys[keep], values[keep]))
+            self._chunks = chunks
+
+    def values(self) -> list:
+        """Return the cached blocks of values."""
+        return [values for _, values in self._chunks]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the cached values in bytes."""
+        return sum(values.nbytes for _, values in self._chunks)
+
+    def __len__(self) -> int:
+        """Return the number of cached items."""
+        return sum(len(keys) for keys, _ in self._chunks)
+
+
+class BlockCache(collections.abc.MutableMapping):
+    """Cache storing items in fixed-size blocks instead of per-item entries.
+
+    Each block is a list of 'block_size' values, which has a much smaller
+    memory overhead than one dict entry per item. 'znslice(block_size=...)'
+    loads whole blocks at once and, if 'max_blocks' is set, the least
+    recently used blocks are evicted as units.
+    """
+
+    _missing = object()
+
+    def __init__(self, block_size: int = 1024, max_blocks: int = None):
+        """Initialize the BlockCache.
+
+        Parameters
+        ----------
+        block_size: int, default=1024
+            number of items per block.
+        max_blocks: int, optional
+            maximum number of blocks to keep. If None, blocks are never evicted.
+        """
+        if block_size < 1:
+            raise ValueError(f"'block_size' must be positive, got {block_size}.")
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._blocks = collections.OrderedDict()
+        self._counts = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        """Get a value and mark its block as recently used."""
+        block, offset = divmod(key, self.block_size)
+        value = self._blocks[block][offset]
+        if value is self._missing:
+            raise KeyError(key)
+        if self.max_blocks is not None:
+            with self._lock:
+                self._blocks.move_to_end(block)
+        return value
+
+    def __setitem__(self, key, value):
+        """Store a value, evicting the least recently used blocks if necessary."""
+        block, offset = divmod(key, self.block_size)
+        with self._lock:
+            if block not in self._blocks:
+                self._blocks[block] = [self._missing] * self.block_size
+                self._counts[block] = 0
+            values = self._blocks[block]
+            if values[offset] is self._missing:
+                self._counts[block] += 1
+            values[offset] = value
+            self._blocks.move_to_end(block)
+            while self.max_blocks is not None and len(self._blocks) > self.max_blocks:
+                old_block, _ = self._blocks.popitem(last=False)
+                del self._counts[old_block]
+
+    def __delitem__(self, key):
+        """Remove a value and its block if it is empty afterwards."""
+        block, offset = divmod(key, self.block_size)
+        with self._lock:
+            values = self._blocks.get(block)
+            if values is None or values[offset] is self._missing:
+                raise KeyError(key)
+            values[offset] = self._missing
+            self._counts[block] -= 1
+            if self._counts[block] == 0:
+                del self._blocks[block]
+                del self._counts[block]
+
+    def reset_range(self, start: int, stop: int):
+        """Remove all items in 'range(start, stop)', dropping whole blocks."""
+        first, last = -(-start // self.block_size), stop // self.block_size
+        with self._lock:
+            if first >= last:
+                # the range does not cover a full block
+                keys = range(start, stop)
+            else:
+                for block in [x for x in self._blocks if first <= x < last]:
+                    del self._blocks[block]
+                    del self._counts[block]
+                keys = itertools.chain(
+                    range(start, first * self.block_size),
+                    range(last * self.block_size, stop),
+                )
+            for key in keys:
+                self.pop(key, None)
+
+    def _snapshot(self) -> dict:
+        """Return a copy of the blocks without touching the LRU order."""
+        with self._lock:
+            return {block: list(values) for block, values in self._blocks.items()}
+
+    def __iter__(self):
+        """Iterate over the keys of all cached items."""
+        for block, values in self._snapshot().items():
+            for offset, value in enumerate(values):
+                if value is not self._missing:
+                    yield block * self.block_size + offset
+
+    def __len__(self) -> int:
+        """Return the number of cached items."""
+        return sum(self._counts.values())
+
+    def values(self) -> list:
+        """Return a snapshot of all cached values."""
+        return [
+            value
+            for values in self._snapshot().values()
+            for value in values
+            if value is not self._missing
+        ]
+
+
+@utils.reset_cache.register
+def _(cache: ArrayCache, indices: list):
+    """Remove all indices from the ArrayCache at once."""
+    cache.reset(indices)
+
+
+@utils.reset_cache.register
+def _(cache: BlockCache, indices: list):
+    """Remove contiguous indices from the BlockCache as a range."""
+    if len(indices) > 0 and indices == list(range(indices[0], indices[-1] + 1)):
+        cache.reset_range(indices[0], indices[-1] + 1)
+    else:
+        for idx in indices:
+            cache.pop(idx, None)
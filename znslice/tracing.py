@@ -0,0 +1,196 @@
+"""ZnSlice tracing module.
+
+Record the time spent in the stages of 'znslice', e.g. index conversion,
+cache handling and the decorated '__getitem__'. Tracing is enabled via
+
+>>> with znslice.tracing.Tracer() as tracer:
+...     data[::2].tolist()
+>>> tracer.to_chrome_trace("trace.json")
+
+or by setting the 'ZNSLICE_TRACE' environment variable to a file path.
+The trace is then written at exit, as 'pstats' file if the path ends with
+'.prof' or '.pstats' and as Chrome trace JSON otherwise.
+"""
+import atexit
+import collections
+import json
+import os
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    import pstats
+
+_tracer = None
+
+
+class Span(typing.NamedTuple):
+    """A finished span. All times are given in nanoseconds."""
+
+    name: str
+    parent: typing.Optional[str]
+    start: int
+    duration: int
+    own_duration: int
+    thread: int
+
+
+class _NullSpan:
+    """Span that does nothing, used if no Tracer is active."""
+
+    def __enter__(self):
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *args):
+        """Do nothing."""
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ActiveSpan:
+    """Span that records its duration to the given Tracer."""
+
+    __slots__ = ("tracer", "name", "parent", "start", "children")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        """Initialize the _ActiveSpan."""
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        """Start the span."""
+        stack = self.tracer._get_stack()
+        self.parent = stack[-1] if stack else None
+        self.children = 0
+        stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        """Stop the span and record it."""
+        duration = time.perf_counter_ns() - self.start
+        self.tracer._get_stack().pop()
+        if self.parent is not None:
+            self.parent.children += duration
+        self.tracer.spans.append(
+            Span(
+                name=self.name,
+                parent=None if self.parent is None else self.parent.name,
+                start=self.start,
+                duration=duration,
+                own_duration=duration - self.children,
+                thread=threading.get_ident(),
+            )
+        )
+
+
+def span(name: str):
+    """Return a context manager recording a span to the active Tracer.
+
+    If no Tracer is active, a shared no-op context manager is returned.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _ActiveSpan(_tracer, name)
+
+
+class Tracer:
+    """Record the spans of all 'znslice' stages while active."""
+
+    def __init__(self):
+        """Initialize the Tracer."""
+        self.spans: typing.List[Span] = []
+        self._local = threading.local()
+        self._previous = None
+
+    def _get_stack(self) -> list:
+        """Return the stack of open spans of the current thread."""
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def __enter__(self):
+        """Activate the Tracer."""
+        global _tracer
+        self._previous, _tracer = _tracer, self
+        return self
+
+    def __exit__(self, *args):
+        """Deactivate the Tracer."""
+        global _tracer
+        _tracer, self._previous = self._previous, None
+
+    def to_chrome_trace(self, file=None) -> dict:
+        """Export the spans in the Chrome trace event format.
+
+        Parameters
+        ----------
+        file: str|os.PathLike, optional
+            write the trace as JSON to this file.
+
+        Returns
+        -------
+        dict:
+            the trace, e.g. to be loaded in 'chrome://tracing' or Perfetto.
+        """
+        trace = {
+            "traceEvents": [
+                {
+                    "name": x.name,
+                    "cat": "znslice",
+                    "ph": "X",
+                    "ts": x.start / 1000,
+                    "dur": x.duration / 1000,
+                    "pid": os.getpid(),
+                    "tid": x.thread,
+                }
+                for x in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+        if file is not None:
+            with open(file, "w") as f:
+                json.dump(trace, f)
+        return trace
+
+    def create_stats(self):
+        """Collect the spans in the 'cProfile' format, used by 'pstats.Stats'."""
+        stats = collections.defaultdict(lambda: [0, 0, 0.0, 0.0, {}])
+        for x in self.spans:
+            entry = stats[("znslice", 0, x.name)]
+            entry[0] += 1
+            entry[1] += 1
+            entry[2] += x.own_duration / 1e9
+            entry[3] += x.duration / 1e9
+            if x.parent is not None:
+                caller = entry[4].setdefault(("znslice", 0, x.parent), [0, 0, 0, 0])
+                caller[0] += 1
+                caller[1] += 1
+                caller[2] += x.own_duration / 1e9
+                caller[3] += x.duration / 1e9
+        self.stats = {
+            key: (cc, nc, tt, ct, {k: tuple(v) for k, v in callers.items()})
+            for key, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+    def to_pstats(self) -> "pstats.Stats":
+        """Return the spans as 'pstats.Stats', e.g. to 'print_stats' or 'dump_stats'."""
+        import pstats  # imported here to keep 'import znslice' fast
+
+        return pstats.Stats(self)
+
+    def dump(self, file):
+        """Write the spans to file, as 'pstats' for '.prof'/'.pstats' else as JSON."""
+        if os.path.splitext(file)[1] in (".prof", ".pstats"):
+            self.to_pstats().dump_stats(file)
+        else:
+            self.to_chrome_trace(file)
+
+
+if _file := os.environ.get("ZNSLICE_TRACE"):
+    atexit.register(Tracer().__enter__().dump, _file)
@@ -1,5 +1,7 @@
 """ZnSlice utils module."""
+import collections
 import functools
+import sys
 
 
 def get_matched_indices(selected, available, single_item) -> list:
@@ -26,6 +28,27 @@ def check_sorted(data: list) -> bool:
     return sorted(data) == data
 
 
+class LazyLength:
+    """Sized object that evaluates the length on the first call to 'len' only."""
+
+    def __init__(self, func):
+        """Initialize the LazyLength.
+
+        Parameters
+        ----------
+        func: callable
+            function without arguments returning the length.
+        """
+        self._func = func
+        self._length = None
+
+    def __len__(self) -> int:
+        """Return the length, evaluating it on the first call."""
+        if self._length is None:
+            self._length = self._func()
+        return self._length
+
+
 def optional_kwargs_decorator(fn):
     """Decorator to allow optional kwargs."""
 
@@ -61,7 +84,9 @@ def _(item: int, self) -> int:
 
 @item_to_indices.register
 def _(item: list, self) -> list:
-    """Keep list as is."""
+    """Keep list as is, evaluating the length at most once."""
+    if not isinstance(self, LazyLength):
+        self = LazyLength(functools.partial(len, self))
     return [item_to_indices(x, self) for x in item]
 
 
@@ -74,23 +99,153 @@ def _(item: tuple, self) -> list:
 @item_to_indices.register
 def _(item: slice, self) -> list:
     """Convert slice to list using the length of the item."""
-    return list(range(len(self)))[item]
+    return list(range(*item.indices(len(self))))
+
+
+def item_to_array(item, self):
+    """Convert item to indices, using an index array for slices.
+
+    Avoids building large intermediate lists in the 'znslice' array mode.
+    Also accepts 'numpy' integer scalars and 1D integer index arrays.
+    """
+    import numpy as np  # only used in array mode, which requires 'numpy'
+
+    if isinstance(item, slice):
+        return np.arange(*item.indices(len(self)))
+    if isinstance(item, np.integer):
+        return item_to_indices(int(item), self)
+    if (
+        isinstance(item, np.ndarray)
+        and item.ndim == 1
+        and np.issubdtype(item.dtype, np.integer)
+    ):
+        indices = item.astype(int)
+        if (indices < 0).any():
+            indices = np.where(indices < 0, indices + len(self), indices)
+        return indices
+    return item_to_indices(item, self)
 
 
 def handle_item(indices, cache, func, self, advanced_slicing=False) -> list:
     """Handle item.
 
-    TODO ...
+    If all indices are cached, the values are returned directly. Otherwise,
+    they are gathered from the cache in a single pass and only missing
+    indices are loaded via 'func'. The gathered values are referenced until
+    the result is returned, so caches that drop values (e.g. 'WeakValueCache')
+    can not lose them in between.
     """
+    try:
+        return [cache[index] for index in indices]
+    except KeyError:
+        pass
+
+    data = {}
+    for index in indices:
+        try:
+            data[index] = cache[index]
+        except KeyError:
+            pass
+
     if advanced_slicing:
-        if new_indices := [x for x in indices if x not in cache]:
+        if new_indices := [x for x in indices if x not in data]:
             # only if len(new_indices) > 0
-            data = func(self, new_indices)
-            for idx, val in zip(new_indices, data):
-                cache[idx] = val
-        return [cache[x] for x in indices]
+            for idx, val in zip(new_indices, func(self, new_indices)):
+                data[idx] = cache[idx] = val
+        return [data[x] for x in indices]
 
     for index in indices:
-        if index not in cache:
-            cache[index] = func(self, index)
-    return [cache[index] for index in indices]
+        if index not in data:
+            data[index] = cache[index] = func(self, index)
+    return [data[index] for index in indices]
+
+
+def handle_block(
+    indices, cache, func, self, advanced_slicing=False, length=None
+) -> list:
+    """Handle item for the 'BlockCache'.
+
+    If an index is missing, its whole block is loaded via 'handle_item'.
+    Values are gathered block by block, so blocks evicted in between do not
+    affect the result. 'length' is used to limit the last block and for the
+    bounds check and defaults to 'self'.
+    """
+    if length is None:
+        length = self
+
+    try:
+        return [cache[index] for index in indices]
+    except KeyError:
+        pass
+
+    by_block = collections.defaultdict(list)
+    for index in indices:
+        by_block[index // cache.block_size].append(index)
+
+    data = {}
+    for block, block_indices in by_block.items():
+        try:
+            values = [cache[x] for x in block_indices]
+        except KeyError:
+            start = block * cache.block_size
+            stop = min(start + cache.block_size, len(length))
+            if start < 0 or max(block_indices) >= stop:
+                raise IndexError("Index out of range")
+            block_values = handle_item(
+                list(range(start, stop)), cache, func, self, advanced_slicing
+            )
+            values = [block_values[x - start] for x in block_indices]
+        data.update(zip(block_indices, values))
+    return [data[index] for index in indices]
+
+
+def handle_array(indices, cache, func, self, length=None):
+    """Handle item for array-backed classes.
+
+    All missing indices are loaded with a single call to 'func', which
+    receives a 'slice' if they form a contiguous run and an index array
+    otherwise. The result is stored as a single block in the 'ArrayCache'.
+    'length' is used for the bounds check and defaults to 'self'.
+    """
+    try:
+        return cache.take(indices)
+    except KeyError:
+        pass
+
+    if len(missing := cache.missing(indices)) > 0:
+        start, stop = int(missing[0]), int(missing[-1]) + 1
+        if start < 0 or stop > len(self if length is None else length):
+            raise IndexError("Index out of range")
+        key = slice(start, stop) if stop - start == len(missing) else missing
+        cache.add(missing, func(self, key))
+    elif len(cache) == 0:
+        # empty selection without cached blocks, the backend provides dtype and shape
+        import numpy as np
+
+        return np.asarray(func(self, slice(0, 0)))
+    return cache.take(indices)
+
+
+@functools.singledispatch
+def reset_cache(cache, indices: list):
+    """Remove the given indices from the cache."""
+    for idx in indices:
+        cache.pop(idx, None)
+
+
+def read_indices(file) -> list:
+    """Read a persisted list of indices, separated by whitespace or commas."""
+    with open(file) as f:
+        return [int(x) for x in f.read().replace(",", " ").split()]
+
+
+def get_nbytes(value) -> int:
+    """Get the approximate memory footprint of a value in bytes.
+
+    Uses 'nbytes' for array-like values (e.g. numpy) and 'sys.getsizeof'
+    otherwise. Referenced objects, e.g. list entries, are not included.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
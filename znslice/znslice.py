@@ -1,15 +1,42 @@
 """The main znslice module."""
 import collections.abc
+import concurrent.futures
 import functools
 import logging
+import os
+import time
 import typing
 import weakref
 
-from znslice import utils
+from znslice import tracing, utils
+from znslice.cache import ArrayCache, BlockCache
 
 log = logging.getLogger(__name__)
 
 
+_FULL_RANGE = slice(None)
+
+
+class CacheInfo(typing.NamedTuple):
+    """Information about the 'znslice' cache of an instance."""
+
+    items: int
+    nbytes: int
+
+
+class WarmupReport(typing.NamedTuple):
+    """Summary of preloading the 'znslice' cache of an instance."""
+
+    loaded: int
+    cached: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Return the number of loaded items per second."""
+        return self.loaded / self.seconds if self.seconds > 0 else float("inf")
+
+
 class Reset:
     """Reset the cache for the given items."""
 
@@ -75,27 +102,32 @@ class LazySequence(collections.abc.Sequence):
 
         Todo ...
         """
-        indices = utils.item_to_indices(item, self)
-        single_item = isinstance(indices, int)
-        if single_item:
-            indices = [indices]
-        if not utils.check_sorted(indices):
-            raise ValueError("ZnSlice currently only supports sorted indices.")
-
-        matched_indices = utils.get_matched_indices(
-            selected=indices, available=self._indices, single_item=single_item
-        )
+        with tracing.span("LazySequence.__getitem__"):
+            # subclasses, e.g. 'LiveSequence', update themselves before calling this
+            length = utils.LazyLength(functools.partial(LazySequence.__len__, self))
+            with tracing.span("item_to_indices"):
+                indices = utils.item_to_indices(item, length)
+            single_item = isinstance(indices, int)
+            if single_item:
+                indices = [indices]
+            if not utils.check_sorted(indices):
+                raise ValueError("ZnSlice currently only supports sorted indices.")
 
-        if any(x >= len(self) for x in indices):
-            raise IndexError("Index out of range")
-        lazy_sequence = self._get_new_instance(
-            self._obj, matched_indices, self._lazy_single_item
-        )
-        return (
-            lazy_sequence.tolist()[0]
-            if (single_item and not self._lazy_single_item)
-            else lazy_sequence
-        )
+            with tracing.span("get_matched_indices"):
+                matched_indices = utils.get_matched_indices(
+                    selected=indices, available=self._indices, single_item=single_item
+                )
+
+            if indices and max(indices) >= len(length):
+                raise IndexError("Index out of range")
+            lazy_sequence = self._get_new_instance(
+                self._obj, matched_indices, self._lazy_single_item
+            )
+            return (
+                lazy_sequence.tolist()[0]
+                if (single_item and not self._lazy_single_item)
+                else lazy_sequence
+            )
 
     def __repr__(self) -> str:
         """Return the representation of the LazySequence."""
@@ -122,20 +154,132 @@ class LazySequence(collections.abc.Sequence):
     def tolist(self) -> list:
         """Return the LazySequence as a non-lazy list."""
         data = []
-        for obj, indices in zip(self._obj, self._indices):
-            if isinstance(indices, int):
-                indices = [indices]
-            try:
-                data.extend(obj.__getitem__(indices, _resolve=True))
-            except TypeError:
-                data.extend(obj[x] for x in indices)
+        with tracing.span("LazySequence.tolist"):
+            for obj, indices in zip(self._obj, self._indices):
+                if isinstance(indices, int):
+                    indices = [indices]
+                try:
+                    data.extend(obj.__getitem__(indices, _resolve=True))
+                except TypeError:
+                    data.extend(obj[x] for x in indices)
 
         return data
 
 
+class LiveSequence(LazySequence):
+    """LazySequence following an object that grows while it is used.
+
+    Items appended to the object become visible without rebuilding the
+    indices of the existing items. For objects decorated by 'znslice',
+    cached items are kept. Selections and additions of a LiveSequence
+    return a regular, frozen 'LazySequence'. Only appending is supported.
+    """
+
+    def __init__(self, obj, start: int = 0, lazy_single_item: bool = False):
+        """Initialize the LiveSequence.
+
+        Parameters
+        ----------
+        obj: object
+            the growing object, e.g. a class with a 'znslice' decorated
+            '__getitem__' and a '__len__' that reflects appended items.
+        start: int, default=0
+            the first index of obj to include.
+        lazy_single_item: bool, optional
+            see 'znslice'.
+        """
+        super().__init__([], [], lazy_single_item)
+        self._source = obj
+        self._stop = start
+        self._position = start
+        self.refresh()
+
+    @classmethod
+    def _get_new_instance(cls, *args, **kwargs):
+        return LazySequence(*args, **kwargs)
+
+    def refresh(self) -> int:
+        """Add the items appended to the object since the last refresh.
+
+        The new indices are stored as a new segment. Segments are merged with
+        the preceding one once it is not larger, so the number of segments
+        stays logarithmic. Existing segments are never modified in place,
+        so 'LazySequence' objects created from this one are not affected.
+
+        Returns
+        -------
+        int:
+            the number of new items.
+        """
+        stop = len(self._source)
+        if stop <= self._stop:
+            return 0
+        indices = list(range(self._stop, stop))
+        self._stop = stop
+        new_items = len(indices)
+        while self._indices and len(self._indices[-1]) <= len(indices):
+            indices = self._indices.pop() + indices
+            self._obj.pop()
+        self._obj.append(self._source)
+        self._indices.append(indices)
+        return new_items
+
+    def new_items(self) -> LazySequence:
+        """Return the items appended since the last call as 'LazySequence'.
+
+        The first call returns all items.
+        """
+        self.refresh()
+        indices = list(range(self._position, self._stop))
+        self._position = self._stop
+        return LazySequence([self._source], [indices], self._lazy_single_item)
+
+    def __getitem__(self, item):
+        """Get item from the LiveSequence, including appended items."""
+        self.refresh()
+        return super().__getitem__(item)
+
+    def __len__(self) -> int:
+        """Return the length of the LiveSequence, including appended items."""
+        self.refresh()
+        return super().__len__()
+
+    def tolist(self) -> list:
+        """Return the LiveSequence as a non-lazy list."""
+        self.refresh()
+        return super().tolist()
+
+    def __repr__(self) -> str:
+        """Return the representation of the LiveSequence, including appended items."""
+        self.refresh()
+        return super().__repr__()
+
+    def __add__(self, other):
+        """Add a LazySequence or list to a snapshot of the LiveSequence."""
+        self.refresh()
+        if isinstance(other, LiveSequence):
+            other.refresh()
+        return super().__add__(other)
+
+    def __radd__(self, other):
+        """Add a snapshot of the LiveSequence to a LazySequence."""
+        if not isinstance(other, LazySequence):
+            return NotImplemented
+        self.refresh()
+        return LazySequence.__add__(other, self)
+
+
 @utils.optional_kwargs_decorator
 def znslice(
-    func, cache=True, lazy=False, advanced_slicing=False, lazy_single_item=False
+    func,
+    cache=True,
+    lazy=False,
+    advanced_slicing=False,
+    lazy_single_item=False,
+    array=False,
+    cache_len=False,
+    block_size=None,
+    max_blocks=None,
 ):
     """The 'znslice' decorator.
 
@@ -145,8 +289,10 @@ def znslice(
     ----------
     func: callable
         the '__getitem__(self, item)' method of the class to decorate.
-    cache: bool, default=True
+    cache: bool|callable, default=True
         Cache the output, so it will be loaded from a cache and not via getitem.
+        Can also be a callable, e.g. 'WeakValueCache', returning the mapping
+        that is used as the cache of each instance.
     lazy: bool, default=False
         Return 'LazySequence' instead of the actual data.
     advanced_slicing: bool, default=False
@@ -155,13 +301,111 @@ def znslice(
     lazy_single_item: bool, default=False
         If a single item is requested, return the item instead of a 'LazySequence'.
         Typically, loading a single item is fast enough to not need lazy loading.
+    array: bool, default=False
+        Use the array mode for array-backed classes, e.g. 'h5py' or 'np.memmap'.
+        All missing items are loaded with a single call, passing a 'slice' for
+        contiguous runs and an index array otherwise. The results are cached
+        as blocks in an 'ArrayCache' and selections return a 'numpy' array.
+        Requires 'numpy'.
+    cache_len: bool|callable, default=False
+        Memoize 'len(self)' per instance, e.g. if '__len__' queries a database.
+        The length is evaluated lazily and reset by 'Reset'. Can also be a
+        callable 'cache_len(self)' returning a token, e.g. a modification time;
+        the length is evaluated again whenever the token changes.
+    block_size: int, optional
+        Use a 'BlockCache' storing items in blocks of 'block_size' items.
+        On a cache miss, the whole block is loaded, which suits sequential
+        workloads and has a much lower memory overhead than a dict entry per item.
+    max_blocks: int, optional
+        Evict the least recently used blocks if more than 'max_blocks' blocks
+        are cached. Requires 'block_size'.
 
     Returns
     -------
     callable:
         the decorated '__getitem__(self, item)' method.
     """
-    instance_cache = weakref.WeakKeyDictionary()
+    # caches are keyed by 'id' and removed via 'weakref.finalize', because a
+    # plain dict lookup is much faster than a 'WeakKeyDictionary' lookup.
+    instance_cache = {}
+    len_cache = weakref.WeakKeyDictionary()
+    if block_size is not None and (array or cache is not True):
+        raise ValueError("'block_size' requires 'cache=True' and no 'array'.")
+    if array and callable(cache):
+        raise ValueError("'array' requires 'cache' to be True or False.")
+    if max_blocks is not None and block_size is None:
+        raise ValueError("'max_blocks' requires 'block_size'.")
+
+    if block_size is not None:
+        cache_factory = functools.partial(BlockCache, block_size, max_blocks)
+    elif cache is True or not cache:
+        cache_factory = ArrayCache if array else dict
+    else:
+        cache_factory = cache
+
+    if array:
+        item_to_indices = utils.item_to_array
+        handle_single = handle_many = utils.handle_array
+    elif block_size is not None:
+        item_to_indices = utils.item_to_indices
+        handle_single = handle_many = functools.partial(
+            utils.handle_block, advanced_slicing=advanced_slicing
+        )
+    else:
+        item_to_indices = utils.item_to_indices
+        handle_single = utils.handle_item
+        handle_many = functools.partial(
+            utils.handle_item, advanced_slicing=advanced_slicing
+        )
+
+    # handlers that need the (possibly memoized) length of the instance
+    pass_length = array or block_size is not None
+
+    def get_cache(self, create: bool = True):
+        """Get the cache of the given instance.
+
+        Parameters
+        ----------
+        self: object
+            the class instance.
+        create: bool, default=True
+            create a new cache if the instance has none. Otherwise, return None.
+        """
+        if not cache:
+            return None
+        try:
+            return instance_cache[id(self)]
+        except KeyError:
+            if not create:
+                return None
+        _cache = instance_cache[id(self)] = cache_factory()
+        weakref.finalize(self, instance_cache.pop, id(self), None).atexit = False
+        return _cache
+
+    span_name = f"znslice({func.__qualname__})"
+    # cached single items can be returned before any index conversion,
+    # unless a Tracer is active, which should record every stage
+    fast_path = bool(cache) and not array and not (lazy and lazy_single_item)
+    # 'obj[:]' can be gathered directly if it does not return a 'LazySequence'
+    full_range_fast_path = fast_path and not lazy
+
+    def load(self, item):
+        """Call the decorated '__getitem__', recording a span if tracing."""
+        with tracing.span(func.__qualname__):
+            return func(self, item)
+
+    def get_len(self) -> int:
+        """Get the length of the given instance, using 'len_cache' if enabled."""
+        if not cache_len:
+            return len(self)
+        token = cache_len(self) if callable(cache_len) else None
+        if self in len_cache:
+            cached_token, length = len_cache[self]
+            if cached_token == token:
+                return length
+        length = len(self)
+        len_cache[self] = (token, length)
+        return length
 
     @functools.wraps(func)
     def wrapper(self, item, _resolve: bool = False):
@@ -176,36 +420,160 @@ def znslice(
         _resolve: bool, default=False
             If True, return the actual data instead of a 'LazySequence'.
         """
-        if cache:
-            if self not in instance_cache:
-                instance_cache[self] = {}
-            _cache: dict = instance_cache[self]
-        else:
-            _cache = {}
-
-        if isinstance(item, Reset):
-            if not cache:
-                raise ValueError("Cannot reset cache if cache=False")
-            item = item.item
-            indices = utils.item_to_indices(item, self)
-            if isinstance(indices, int):
-                _cache.pop(indices, None)
-            else:
-                for idx in indices:
-                    _cache.pop(idx, None)
-        else:
-            indices = utils.item_to_indices(item, self)
+        if fast_path and tracing._tracer is None:
+            if type(item) is int:
+                try:
+                    _cache = instance_cache[id(self)]
+                    return _cache[item if item >= 0 else item + get_len(self)]
+                except KeyError:
+                    pass
+            elif full_range_fast_path and type(item) is slice and item == _FULL_RANGE:
+                try:
+                    _cache = instance_cache[id(self)]
+                    return list(map(_cache.__getitem__, range(get_len(self))))
+                except KeyError:
+                    pass
+
+        with tracing.span(span_name):
+            _cache = get_cache(self) if cache else cache_factory()
+            length = utils.LazyLength(functools.partial(get_len, self))
+
+            reset = isinstance(item, Reset)
+            if reset:
+                if not cache:
+                    raise ValueError("Cannot reset cache if cache=False")
+                len_cache.pop(self, None)
+                item = item.item
+            with tracing.span("item_to_indices"):
+                indices = item_to_indices(item, length)
+            if reset:
+                utils.reset_cache(
+                    _cache, [indices] if isinstance(indices, int) else indices
+                )
+
+            kwargs = {"length": length} if pass_length else {}
+            with tracing.span("handle_item"):
+                if lazy and not _resolve:
+                    if not lazy_single_item and isinstance(indices, int):
+                        return handle_single([indices], _cache, load, self, **kwargs)[0]
+                    if isinstance(indices, int):
+                        indices = [indices]
+                    elif array:
+                        indices = [int(x) for x in indices]
+                    if indices and max(indices) >= len(length):
+                        raise IndexError("Index out of range")
+                    return LazySequence([self], [indices], lazy_single_item)
+                if isinstance(indices, int):
+                    return handle_single([indices], _cache, load, self, **kwargs)[0]
+                return handle_many(indices, _cache, load, self, **kwargs)
+
+    wrapper.get_cache = get_cache
+    return wrapper
 
-        if lazy and not _resolve:
-            if not lazy_single_item and isinstance(indices, int):
-                return utils.handle_item([indices], _cache, func, self)[0]
-            if isinstance(indices, int):
-                indices = [indices]
-            if any(x >= len(self) for x in indices):
-                raise IndexError("Index out of range")
-            return LazySequence([self], [indices], lazy_single_item)
-        if isinstance(indices, int):
-            return utils.handle_item([indices], _cache, func, self)[0]
-        return utils.handle_item(indices, _cache, func, self, advanced_slicing)
 
-    return wrapper
+def _get_cache_getter(obj) -> typing.Callable:
+    """Return the 'get_cache' function of the 'znslice' decorated '__getitem__'."""
+    try:
+        return type(obj).__getitem__.get_cache
+    except AttributeError as err:
+        raise TypeError(
+            f"'{type(obj).__name__}' is not decorated by 'znslice'"
+        ) from err
+
+
+def cache_info(obj) -> CacheInfo:
+    """Report the number of cached items and their approximate memory footprint.
+
+    Parameters
+    ----------
+    obj: object
+        instance of a class with a 'znslice' decorated '__getitem__'.
+
+    Returns
+    -------
+    CacheInfo:
+        the number of cached items and their approximate size in bytes.
+    """
+    get_cache = _get_cache_getter(obj)
+    _cache = get_cache(obj, create=False)
+    if _cache is None:
+        return CacheInfo(items=0, nbytes=0)
+    if isinstance(_cache, ArrayCache):
+        return CacheInfo(items=len(_cache), nbytes=_cache.nbytes)
+    values = list(_cache.values())
+    return CacheInfo(items=len(values), nbytes=sum(map(utils.get_nbytes, values)))
+
+
+def warm(
+    obj, indices=None, workers: int = 1, batch_size: int = 1024, callback=None
+) -> WarmupReport:
+    """Preload the 'znslice' cache of an instance, e.g. at service startup.
+
+    Only indices that are not cached yet are loaded. They are requested in
+    batches via the decorated '__getitem__', so classes using 'advanced_slicing'
+    or 'array' load each batch with a single call.
+
+    Parameters
+    ----------
+    obj: object
+        instance of a class with a 'znslice' decorated '__getitem__'.
+    indices: int, slice, list, tuple, str, os.PathLike, optional
+        the indices to load. A path is read via 'utils.read_indices'.
+        If None, all items are loaded.
+    workers: int, default=1
+        number of threads loading batches in parallel.
+    batch_size: int, default=1024
+        number of items requested per call to '__getitem__'.
+    callback: callable, optional
+        called as 'callback(loaded, total)' after each finished batch.
+
+    Returns
+    -------
+    WarmupReport:
+        the number of loaded and already cached items and the elapsed time.
+    """
+    _cache = _get_cache_getter(obj)(obj)
+    if _cache is None:
+        raise ValueError("Cannot warm cache if cache=False")
+    if indices is None:
+        indices = slice(None)
+    elif isinstance(indices, (str, os.PathLike)):
+        indices = utils.read_indices(indices)
+    indices = utils.item_to_indices(indices, obj)
+    indices = list(dict.fromkeys([indices] if isinstance(indices, int) else indices))
+
+    if isinstance(_cache, ArrayCache):
+        missing = _cache.missing(indices).tolist()
+    else:
+        missing = [x for x in indices if x not in _cache]
+    batches = [missing[x : x + batch_size] for x in range(0, len(missing), batch_size)]
+
+    def load(batch) -> int:
+        """Load the batch into the cache."""
+        obj.__getitem__(batch, _resolve=True)
+        return len(batch)
+
+    def load_batches() -> typing.Iterator[int]:
+        """Load all batches, yielding their sizes once they are finished."""
+        if workers <= 1:
+            yield from map(load, batches)
+            return
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            futures = [executor.submit(load, batch) for batch in batches]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+
+    start, loaded = time.perf_counter(), 0
+    with tracing.span("warm"):
+        for size in load_batches():
+            loaded += size
+            if callback is not None:
+                callback(loaded, len(missing))
+
+    report = WarmupReport(
+        loaded=loaded,
+        cached=len(indices) - len(missing),
+        seconds=time.perf_counter() - start,
+    )
+    log.debug(f"Warmed up {report.loaded} items at {report.throughput:.1f} items/s")
+    return report